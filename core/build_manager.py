@@ -1,9 +1,14 @@
 """Build process manager for sBitx Branch Manager"""
 
+import os
+import stat
 import subprocess
+import sys
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional
+from typing import BinaryIO, Callable, Optional, Tuple
+
+from core.process import run_command
 
 
 @dataclass
@@ -22,12 +27,27 @@ class BuildManager:
     """Manages the sBitx build process"""
 
     @staticmethod
-    def run_build(target_path: str) -> BuildResult:
+    def run_build(
+        target_path: str,
+        on_line: Optional[Callable[[str], None]] = None,
+        logfile: Optional[Path] = None,
+        jobs: Optional[int] = None
+    ) -> BuildResult:
         """
         Execute the sBitx build script
 
         Args:
             target_path: Path to sbitx directory (should be /home/pi/sbitx)
+            on_line: Receives each complete line of the build's combined
+                     stdout/stderr, decoded and without its line ending, as
+                     soon as it is produced
+            logfile: File to spool the full build output to. The output is
+                     streamed to disk rather than held in memory.
+            jobs: Parallel make jobs, passed via MAKEFLAGS. Defaults to the
+                  number of CPUs; compiling sources in parallel cuts wall
+                  time roughly linearly until linking dominates.
+
+        Output is always shown in the terminal as well.
 
         Returns:
             BuildResult with build status
@@ -37,42 +57,64 @@ class BuildManager:
         """
         build_script = Path(target_path) / 'build'
 
-        # Check if build script exists
-        if not build_script.exists():
+        # Check the build script exists and is an executable file with one stat
+        try:
+            st = os.stat(build_script)
+        except FileNotFoundError:
             raise BuildError(
                 f"Build script not found at {build_script}\n"
                 "Make sure you're in the correct sBitx directory."
             )
 
-        # Check if build script is executable
-        if not build_script.is_file():
+        if not stat.S_ISREG(st.st_mode):
             raise BuildError(f"{build_script} is not a file")
 
+        if not st.st_mode & 0o111:
+            raise BuildError(
+                f"{build_script} is not executable\n"
+                f"Run: chmod +x {build_script}"
+            )
+
+        log = None
         try:
             # Run the build command: ./build sbitx
             print("\n" + "="*60)
             print("=== Building sBitx (this may take several minutes) ===")
             print("="*60 + "\n")
 
-            result = subprocess.run(
+            feed_lines = flush_lines = None
+            if on_line is not None:
+                feed_lines, flush_lines = BuildManager._line_splitter(on_line)
+
+            forward = None
+            if on_line is not None or logfile is not None:
+                if logfile is not None:
+                    log = open(logfile, 'wb', buffering=65536)
+                forward = BuildManager._tee_output(feed_lines, log)
+
+            returncode = run_command(
                 ['./build', 'sbitx'],
                 cwd=target_path,
-                timeout=900  # 15 minutes max
+                timeout=900,  # 15 minutes max
+                on_output=forward,
+                env=BuildManager._make_env(jobs)
             )
+            if flush_lines is not None:
+                flush_lines()
 
             print("\n" + "="*60)
-            if result.returncode == 0:
+            if returncode == 0:
                 print("=== Build completed successfully ===")
             else:
-                print(f"=== Build finished with exit code {result.returncode} ===")
+                print(f"=== Build finished with exit code {returncode} ===")
             print("="*60 + "\n")
 
             # Consider successful if returncode is 0
-            success = (result.returncode == 0)
+            success = (returncode == 0)
 
             return BuildResult(
                 success=success,
-                returncode=result.returncode
+                returncode=returncode
             )
 
         except subprocess.TimeoutExpired:
@@ -82,6 +124,69 @@ class BuildManager:
             )
         except Exception as e:
             raise BuildError(f"Failed to run build: {e}")
+        finally:
+            if log is not None:
+                log.close()
+
+    @staticmethod
+    def _make_env(jobs: Optional[int]) -> dict:
+        """Environment for make with MAKEFLAGS requesting parallel jobs"""
+        # Respect MAKEFLAGS the user already set unless jobs was given
+        if jobs is None and 'MAKEFLAGS' in os.environ:
+            return dict(os.environ)
+        jobs = jobs or os.cpu_count() or 2
+        return {**os.environ, 'MAKEFLAGS': f'-j{jobs}'}
+
+    @staticmethod
+    def _tee_output(
+        on_output: Optional[Callable[[bytes], None]],
+        log: Optional[BinaryIO]
+    ) -> Callable[[bytes], None]:
+        """Build an output callback that echoes to the terminal, log and on_output"""
+        terminal = sys.stdout.buffer if sys.stdout is not None else None
+        if terminal is not None:
+            # Flush pending print() text so it stays ahead of the raw output
+            sys.stdout.flush()
+
+        def forward(chunk: bytes):
+            if terminal is not None:
+                terminal.write(chunk)
+                terminal.flush()
+            if log is not None:
+                log.write(chunk)
+            if on_output is not None:
+                on_output(chunk)
+
+        return forward
+
+    @staticmethod
+    def _line_splitter(
+        on_line: Callable[[str], None]
+    ) -> Tuple[Callable[[bytes], None], Callable[[], None]]:
+        """
+        Turn output chunks into complete lines for on_line
+
+        Chunks end wherever a read happened to stop, so the text after the
+        last newline is held back until the rest of its line arrives.
+
+        Returns:
+            Tuple of (feed, flush): feed takes each chunk, flush passes on an
+            unterminated last line once the output has ended
+        """
+        partial = bytearray()
+
+        def feed(chunk: bytes):
+            lines = (partial + chunk).split(b'\n')
+            partial[:] = lines.pop()
+            for line in lines:
+                on_line(line.decode('utf-8', 'replace').rstrip('\r'))
+
+        def flush():
+            if partial:
+                on_line(partial.decode('utf-8', 'replace').rstrip('\r'))
+                partial.clear()
+
+        return feed, flush
 
     @staticmethod
     def check_build_prerequisites(target_path: str) -> tuple[bool, str]:
@@ -95,20 +200,26 @@ class BuildManager:
             Tuple of (prerequisites_met, message)
         """
         issues = []
+        root = Path(target_path)
 
-        # Check if directory exists
-        if not Path(target_path).exists():
-            issues.append(f"Directory {target_path} does not exist")
+        # Collect the required entries in a single directory read
+        required = {'build', 'Makefile'}
+        found = set()
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.name in required:
+                        found.add(entry.name)
+        except FileNotFoundError:
+            return False, f"Directory {target_path} does not exist"
+        except NotADirectoryError:
+            return False, f"{target_path} is not a directory"
 
-        # Check if build script exists
-        build_script = Path(target_path) / 'build'
-        if not build_script.exists():
-            issues.append(f"Build script not found at {build_script}")
+        if 'build' not in found:
+            issues.append(f"Build script not found at {root / 'build'}")
 
-        # Check for Makefile
-        makefile = Path(target_path) / 'Makefile'
-        if not makefile.exists():
-            issues.append(f"Makefile not found at {makefile}")
+        if 'Makefile' not in found:
+            issues.append(f"Makefile not found at {root / 'Makefile'}")
 
         if issues:
             return False, "\n".join(issues)
@@ -116,32 +227,38 @@ class BuildManager:
         return True, "All prerequisites met"
 
     @staticmethod
-    def clean_build(target_path: str) -> BuildResult:
+    def clean_build(
+        target_path: str,
+        jobs: Optional[int] = None
+    ) -> BuildResult:
         """
         Run 'make clean' before building
 
         Args:
             target_path: Path to sbitx directory
+            jobs: Parallel make jobs, passed via MAKEFLAGS. Defaults to the
+                  number of CPUs.
 
         Returns:
             BuildResult with clean operation status
         """
         try:
             print("\n=== Running make clean ===")
-            result = subprocess.run(
+            returncode = run_command(
                 ['make', 'clean'],
                 cwd=target_path,
-                timeout=60
+                timeout=60,
+                env=BuildManager._make_env(jobs)
             )
 
-            if result.returncode == 0:
+            if returncode == 0:
                 print("=== Clean completed successfully ===\n")
             else:
-                print(f"=== Clean finished with exit code {result.returncode} ===\n")
+                print(f"=== Clean finished with exit code {returncode} ===\n")
 
             return BuildResult(
-                success=result.returncode == 0,
-                returncode=result.returncode
+                success=returncode == 0,
+                returncode=returncode
             )
 
         except subprocess.TimeoutExpired:
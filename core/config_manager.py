@@ -1,8 +1,11 @@
 """Configuration manager for sBitx Branch Manager"""
 
+import copy
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from models.repository import Repository
 
 
@@ -29,8 +32,16 @@ class ConfigManager:
 
         self.config_dir = Path(config_dir)
         self.config_file = self.config_dir / 'repositories.json'
+        self._tmp_file = self.config_dir / 'repositories.json.tmp'
+        self.branches_cache_file = self.config_dir / 'branches_cache.json'
+        self._branches_tmp_file = self.config_dir / 'branches_cache.json.tmp'
         self._ensure_config_dir()
 
+        # Parsed config and the mtime it was read at, so repeated
+        # reads skip re-reading the file when it is unchanged
+        self._cache: Optional[dict] = None
+        self._mtime: Optional[int] = None
+
     def _ensure_config_dir(self):
         """Create config directory if it doesn't exist"""
         self.config_dir.mkdir(parents=True, exist_ok=True)
@@ -39,25 +50,47 @@ class ConfigManager:
         """
         Load configuration from JSON file
 
+        The parsed config is cached and only re-read when the file's mtime
+        changes. A copy is returned so callers may mutate it freely.
+
         Returns:
             Configuration dictionary
 
         Raises:
             ConfigError: If config file is corrupted
         """
-        if not self.config_file.exists():
+        return copy.deepcopy(self._read_config())
+
+    def _read_config(self) -> dict:
+        """
+        Return the cached config, re-reading the file if its mtime changed
+
+        The returned dictionary is shared with the cache and must not be
+        modified; use load_config() for a private copy.
+
+        Raises:
+            ConfigError: If config file is corrupted
+        """
+        try:
+            mtime = os.stat(self.config_file).st_mtime_ns
+        except FileNotFoundError:
             return self._create_default_config()
 
+        if self._cache is not None and mtime == self._mtime:
+            return self._cache
+
         try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
+            config = json.loads(self.config_file.read_bytes())
+
+            self._cache = config
+            self._mtime = mtime
 
             # Ensure default_repositories key exists
             if 'default_repositories' not in config:
                 config['default_repositories'] = ['https://github.com/drexjj/sbitx.git']
                 self.save_config(config)
 
-            return config
+            return self._cache
         except json.JSONDecodeError as e:
             # Backup corrupted config
             backup_file = self.config_file.with_suffix('.json.backup')
@@ -74,8 +107,6 @@ class ConfigManager:
 
     def _create_default_config(self) -> dict:
         """Create default configuration"""
-        from models.repository import Repository
-
         # Add default repository (drexjj/sbitx)
         default_repo = Repository.create_new('drexjj/sbitx')
 
@@ -92,6 +123,9 @@ class ConfigManager:
         """
         Save configuration to JSON file
 
+        The config is written to a temporary sibling file and moved into
+        place, so a crash mid-write never leaves a truncated config behind.
+
         Args:
             config: Configuration dictionary to save
 
@@ -99,19 +133,53 @@ class ConfigManager:
             ConfigError: If save fails
         """
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            self._write_json(self.config_file, self._tmp_file, config)
+            self._cache = copy.deepcopy(config)
+            self._mtime = os.stat(self.config_file).st_mtime_ns
         except Exception as e:
             raise ConfigError(f"Failed to save config: {e}")
 
-    def load_repositories(self) -> List[Repository]:
+    @staticmethod
+    def _write_json(path: Path, tmp_file: Path, data):
+        """Atomically replace path with data serialized as JSON"""
+        try:
+            with open(tmp_file, 'w') as f:
+                # Compact separators avoid the stdlib encoder's slow
+                # pretty-printing path; the file is not meant to be hand-edited
+                json.dump(data, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, path)
+        except Exception:
+            tmp_file.unlink(missing_ok=True)
+            raise
+
+    @contextmanager
+    def mutate(self) -> Iterator[dict]:
         """
-        Load repository list from config file
+        Load the config once and save it once for a batch of changes
 
-        Returns:
-            List of Repository objects
+        Use with the *_nosave helpers to apply several changes with a single
+        file write:
+
+            with config_manager.mutate() as config:
+                config_manager.add_repository_nosave(config, repo)
+                config_manager.set_last_used_nosave(config, url, branch)
+
+        Nothing is written if the block raises or leaves the config unchanged.
+
+        Yields:
+            Configuration dictionary to modify in place
         """
         config = self.load_config()
+        original = self._cache
+        yield config
+        if config != original:
+            self.save_config(config)
+
+    @staticmethod
+    def _repositories_from_config(config: dict) -> List[Repository]:
+        """Build Repository objects from a loaded config dictionary"""
         repos = []
         for repo_data in config.get('repositories', []):
             try:
@@ -121,6 +189,15 @@ class ConfigManager:
                 continue
         return repos
 
+    def load_repositories(self) -> List[Repository]:
+        """
+        Load repository list from config file
+
+        Returns:
+            List of Repository objects
+        """
+        return self._repositories_from_config(self._read_config())
+
     def save_repositories(self, repositories: List[Repository]):
         """
         Save repository list to config file
@@ -128,9 +205,13 @@ class ConfigManager:
         Args:
             repositories: List of Repository objects to save
         """
-        config = self.load_config()
+        with self.mutate() as config:
+            self.save_repositories_nosave(config, repositories)
+
+    @staticmethod
+    def save_repositories_nosave(config: dict, repositories: List[Repository]):
+        """Replace the repository list in a loaded config without saving"""
         config['repositories'] = [repo.to_dict() for repo in repositories]
-        self.save_config(config)
 
     def add_repository(self, repository: Repository) -> bool:
         """
@@ -142,7 +223,13 @@ class ConfigManager:
         Returns:
             True if added, False if already exists
         """
-        repos = self.load_repositories()
+        with self.mutate() as config:
+            return self.add_repository_nosave(config, repository)
+
+    @classmethod
+    def add_repository_nosave(cls, config: dict, repository: Repository) -> bool:
+        """Add a repository to a loaded config without saving"""
+        repos = cls._repositories_from_config(config)
 
         # Check if repository already exists
         for repo in repos:
@@ -150,7 +237,7 @@ class ConfigManager:
                 return False
 
         repos.append(repository)
-        self.save_repositories(repos)
+        cls.save_repositories_nosave(config, repos)
         return True
 
     def is_default_repository(self, url: str) -> bool:
@@ -163,7 +250,7 @@ class ConfigManager:
         Returns:
             True if it's a default repository
         """
-        config = self.load_config()
+        config = self._read_config()
         default_repos = config.get('default_repositories', [])
         return url in default_repos
 
@@ -177,17 +264,23 @@ class ConfigManager:
         Returns:
             True if removed, False if not found or is a default repo
         """
+        with self.mutate() as config:
+            return self.remove_repository_nosave(config, url)
+
+    @classmethod
+    def remove_repository_nosave(cls, config: dict, url: str) -> bool:
+        """Remove a repository from a loaded config without saving"""
         # Check if it's a default repository
-        if self.is_default_repository(url):
+        if url in config.get('default_repositories', []):
             return False
 
-        repos = self.load_repositories()
+        repos = cls._repositories_from_config(config)
         initial_count = len(repos)
 
         repos = [repo for repo in repos if repo.url != url]
 
         if len(repos) < initial_count:
-            self.save_repositories(repos)
+            cls.save_repositories_nosave(config, repos)
             return True
         return False
 
@@ -198,7 +291,7 @@ class ConfigManager:
         Returns:
             Tuple of (repo_url, branch_name)
         """
-        config = self.load_config()
+        config = self._read_config()
         return (
             config.get('last_used_repo', ''),
             config.get('last_used_branch', '')
@@ -212,7 +305,58 @@ class ConfigManager:
             repo_url: Repository URL
             branch_name: Branch name
         """
-        config = self.load_config()
+        with self.mutate() as config:
+            self.set_last_used_nosave(config, repo_url, branch_name)
+
+    @staticmethod
+    def set_last_used_nosave(config: dict, repo_url: str, branch_name: str):
+        """Set last used repository and branch in a loaded config without saving"""
         config['last_used_repo'] = repo_url
         config['last_used_branch'] = branch_name
-        self.save_config(config)
+
+    def load_branches_cache(self) -> Dict[str, Tuple[float, List[str]]]:
+        """
+        Load branch lists saved by a previous session
+
+        The cache is only an optimization, so a missing or unreadable file
+        yields an empty cache rather than an error.
+
+        Returns:
+            Dictionary mapping repository URL to (time.time() of fetch,
+            branch names)
+        """
+        try:
+            data = json.loads(self.branches_cache_file.read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+        cache = {}
+        if isinstance(data, dict):
+            for url, entry in data.items():
+                try:
+                    cache[url] = (float(entry['ts']), list(entry['branches']))
+                except (KeyError, TypeError, ValueError):
+                    # Skip malformed entries
+                    continue
+        return cache
+
+    def save_branches_cache(self, cache: Dict[str, Tuple[float, List[str]]]):
+        """
+        Save branch lists for the next session
+
+        Args:
+            cache: Dictionary mapping repository URL to (time.time() of
+                   fetch, branch names)
+
+        Raises:
+            ConfigError: If save fails
+        """
+        try:
+            # Iterate over a snapshot in case fetch threads are still adding
+            data = {
+                url: {'ts': ts, 'branches': branches}
+                for url, (ts, branches) in dict(cache).items()
+            }
+            self._write_json(self.branches_cache_file, self._branches_tmp_file, data)
+        except Exception as e:
+            raise ConfigError(f"Failed to save branches cache: {e}")
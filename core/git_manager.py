@@ -1,11 +1,29 @@
 """Git operations manager for sBitx Branch Manager"""
 
+import functools
+import os
 import subprocess
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass
 
+from core.process import run_command
+from models.repository import Repository
+
+# Prefix of branch refs in raw 'git ls-remote' output
+_HEADS_PREFIX = b'refs/heads/'
+_HEADS_LEN = len(_HEADS_PREFIX)
+
+# Prefix of .git/HEAD when a branch is checked out
+_HEAD_REF_PREFIX = 'ref: refs/heads/'
+_HEAD_REF_LEN = len(_HEAD_REF_PREFIX)
+
+# get_current_remote runs on every status refresh, usually with the same URL;
+# normalization is pure, so memoize it
+_normalize_url = functools.lru_cache(maxsize=64)(Repository.validate_and_normalize_url)
+
 
 class DirectoryStatus(Enum):
     """Status of target directory"""
@@ -29,6 +47,18 @@ class GitError(Exception):
 class GitManager:
     """Manages all git operations for repository checkout and branch management"""
 
+    # Seconds a fetch_branches result is reused before hitting the network again
+    BRANCH_CACHE_TTL = 300
+
+    # repo_url -> (time.time() of fetch, sorted branch names). Wall-clock time
+    # so entries saved by a previous session can be aged when restored.
+    _branch_cache: Dict[str, Tuple[float, List[str]]] = {}
+
+    # target_path -> ((.git/HEAD, .git/config) st_mtime_ns, get_repo_state result).
+    # Checkouts rewrite HEAD and remote changes rewrite config, so unchanged
+    # mtimes mean the cached state is still current.
+    _status_cache: Dict[str, Tuple[Tuple[int, int], Tuple[Optional[str], Optional[str]]]] = {}
+
     @staticmethod
     def check_directory_status(path: str) -> DirectoryStatus:
         """
@@ -59,11 +89,17 @@ class GitManager:
         else:
             return DirectoryStatus.NON_GIT
 
-    @staticmethod
-    def fetch_branches(repo_url: str) -> List[str]:
+    @classmethod
+    def fetch_branches(cls, repo_url: str) -> List[str]:
         """
         Fetch branch list from remote repository without cloning
 
+        Uses 'git ls-remote --heads', which only exchanges the ref
+        advertisement for branches; no objects are transferred and no local
+        repository is needed. Results are cached per URL for
+        BRANCH_CACHE_TTL seconds so repeated refreshes don't each pay a
+        full ls-remote round trip.
+
         Args:
             repo_url: Repository URL
 
@@ -73,32 +109,35 @@ class GitManager:
         Raises:
             GitError: If fetch fails
         """
+        cached = cls.get_cached_branches(repo_url, cls.BRANCH_CACHE_TTL)
+        if cached is not None:
+            return cached
+
         try:
             result = subprocess.run(
                 ['git', 'ls-remote', '--heads', repo_url],
                 capture_output=True,
-                text=True,
                 timeout=30
             )
 
             if result.returncode != 0:
                 raise GitError(
                     f"Failed to fetch branches from {repo_url}\n"
-                    f"Error: {result.stderr}\n"
+                    f"Error: {result.stderr.decode('utf-8', 'replace')}\n"
                     "Check your network connection and repository URL."
                 )
 
+            # Parse the raw bytes in one pass; only branch names are decoded
             branches = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    # Format: "hash\trefs/heads/branch_name"
-                    parts = line.split('\t')
-                    if len(parts) == 2:
-                        ref = parts[1]
-                        branch_name = ref.replace('refs/heads/', '')
-                        branches.append(branch_name)
+            for line in result.stdout.splitlines():
+                # Format: b"hash\trefs/heads/branch_name"
+                _, _, ref = line.partition(b'\t')
+                if ref.startswith(_HEADS_PREFIX):
+                    branches.append(ref[_HEADS_LEN:].decode('utf-8', 'replace'))
 
-            return sorted(branches)
+            branches.sort()
+            cls._branch_cache[repo_url] = (time.time(), branches)
+            return list(branches)
 
         except subprocess.TimeoutExpired:
             raise GitError(
@@ -108,6 +147,110 @@ class GitManager:
         except Exception as e:
             raise GitError(f"Failed to fetch branches: {e}")
 
+    @staticmethod
+    def fetch_branches_local(target_path: str) -> List[str]:
+        """
+        List origin's branches from the remote-tracking refs of a local clone
+
+        This only reads the local repository, so it avoids the network round
+        trip of fetch_branches. The result is as fresh as the clone's last fetch.
+
+        Args:
+            target_path: Path to git repository cloned from the remote
+
+        Returns:
+            List of branch names
+
+        Raises:
+            GitError: If the refs cannot be read
+        """
+        try:
+            result = subprocess.run(
+                ['git', 'for-each-ref', '--format=%(refname:lstrip=3)', 'refs/remotes/origin'],
+                cwd=target_path,
+                capture_output=True,
+                timeout=10
+            )
+
+            if result.returncode != 0:
+                raise GitError(
+                    f"Failed to read branches in {target_path}\n"
+                    f"Error: {result.stderr.decode('utf-8', 'replace')}"
+                )
+
+            # Skip the origin/HEAD symref
+            return sorted(
+                name.decode('utf-8', 'replace')
+                for name in result.stdout.splitlines()
+                if name != b'HEAD'
+            )
+
+        except GitError:
+            raise
+        except Exception as e:
+            raise GitError(f"Failed to read local branches: {e}")
+
+    @classmethod
+    def get_cached_branches(cls, repo_url: str, max_age: Optional[float] = None) -> Optional[List[str]]:
+        """
+        Return a cached fetch_branches result without touching the network
+
+        Args:
+            repo_url: Repository URL
+            max_age: Oldest acceptable result in seconds, or None for any age
+
+        Returns:
+            List of branch names, or None if nothing suitable is cached
+        """
+        cached = cls._branch_cache.get(repo_url)
+        if cached is None:
+            return None
+        # A negative age means the wall clock stepped back (e.g. a Pi without
+        # an RTC before NTP syncs); the entry's age is unknown, so don't trust it
+        if max_age is not None and not 0 <= time.time() - cached[0] < max_age:
+            return None
+        return list(cached[1])
+
+    @classmethod
+    def branch_cache_snapshot(cls) -> Dict[str, Tuple[float, List[str]]]:
+        """
+        Copy the branch cache, e.g. to save it for the next session
+
+        Returns:
+            Dictionary mapping repository URL to (time.time() of fetch,
+            branch names)
+        """
+        return dict(cls._branch_cache)
+
+    @classmethod
+    def restore_branch_cache(cls, entries: Dict[str, Tuple[float, List[str]]]):
+        """
+        Seed the branch cache with entries saved by a previous session
+
+        Entries older than what is already cached are ignored.
+
+        Args:
+            entries: Dictionary mapping repository URL to (time.time() of
+                     fetch, branch names)
+        """
+        for url, (ts, branches) in entries.items():
+            current = cls._branch_cache.get(url)
+            if current is None or current[0] < ts:
+                cls._branch_cache[url] = (ts, sorted(branches))
+
+    @classmethod
+    def invalidate_branch_cache(cls, repo_url: Optional[str] = None):
+        """
+        Drop cached fetch_branches results
+
+        Args:
+            repo_url: Repository URL to drop, or None to clear the whole cache
+        """
+        if repo_url is None:
+            cls._branch_cache.clear()
+        else:
+            cls._branch_cache.pop(repo_url, None)
+
     @staticmethod
     def clone_repository(repo_url: str, target_path: str) -> CommandResult:
         """
@@ -125,18 +268,19 @@ class GitManager:
         """
         try:
             print(f"\n=== Cloning {repo_url} to {target_path} ===")
-            result = subprocess.run(
+            returncode = run_command(
                 ['git', 'clone', repo_url, target_path],
                 timeout=300  # 5 minutes
             )
 
-            if result.returncode != 0:
-                raise GitError(f"Failed to clone repository (exit code: {result.returncode})")
+            if returncode != 0:
+                raise GitError(f"Failed to clone repository (exit code: {returncode})")
 
+            GitManager.invalidate_branch_cache(repo_url)
             print("=== Clone completed ===\n")
             return CommandResult(
                 success=True,
-                returncode=result.returncode
+                returncode=returncode
             )
 
         except subprocess.TimeoutExpired:
@@ -165,34 +309,28 @@ class GitManager:
         try:
             # Change remote URL
             print(f"\n=== Changing remote to {repo_url} ===")
-            result = subprocess.run(
+            returncode = run_command(
                 ['git', 'remote', 'set-url', 'origin', repo_url],
                 cwd=target_path,
                 timeout=10
             )
 
-            if result.returncode != 0:
-                raise GitError(f"Failed to change remote URL (exit code: {result.returncode})")
-
-            # Prune old remote refs to avoid conflicts
-            print("=== Pruning old remote references ===")
-            prune_result = subprocess.run(
-                ['git', 'remote', 'prune', 'origin'],
-                cwd=target_path,
-                timeout=30
-            )
+            if returncode != 0:
+                raise GitError(f"Failed to change remote URL (exit code: {returncode})")
 
-            # Fetch from new remote with prune to clean up stale refs
+            # Fetch from new remote; --prune also drops the old remote's refs,
+            # so no separate 'git remote prune' is needed
             print("=== Fetching from new remote ===")
-            fetch_result = subprocess.run(
+            fetch_returncode = run_command(
                 ['git', 'fetch', 'origin', '--prune'],
                 cwd=target_path,
                 timeout=300  # 5 minutes
             )
 
-            if fetch_result.returncode != 0:
-                raise GitError(f"Failed to fetch from new remote (exit code: {fetch_result.returncode})")
+            if fetch_returncode != 0:
+                raise GitError(f"Failed to fetch from new remote (exit code: {fetch_returncode})")
 
+            GitManager.invalidate_branch_cache(repo_url)
             print("=== Remote changed successfully ===\n")
             return CommandResult(
                 success=True,
@@ -222,22 +360,22 @@ class GitManager:
         try:
             # Use checkout -B to create/reset branch to match remote
             print(f"\n=== Checking out branch '{branch}' ===")
-            result = subprocess.run(
+            returncode = run_command(
                 ['git', 'checkout', '-B', branch, f'origin/{branch}'],
                 cwd=target_path,
                 timeout=60
             )
 
-            if result.returncode != 0:
+            if returncode != 0:
                 raise GitError(
-                    f"Failed to checkout branch '{branch}' (exit code: {result.returncode})\n"
+                    f"Failed to checkout branch '{branch}' (exit code: {returncode})\n"
                     "Make sure the branch exists on the remote."
                 )
 
             print(f"=== Branch '{branch}' checked out successfully ===\n")
             return CommandResult(
                 success=True,
-                returncode=result.returncode
+                returncode=returncode
             )
 
         except subprocess.TimeoutExpired:
@@ -295,14 +433,110 @@ class GitManager:
             if result.returncode == 0:
                 url = result.stdout.strip()
                 # Normalize URL to match our repository format
-                from models.repository import Repository
-                normalized = Repository.validate_and_normalize_url(url)
+                normalized = _normalize_url(url)
                 return normalized if normalized else url
             return None
 
         except Exception:
             return None
 
+    @staticmethod
+    def _read_head_branch(target_path: str) -> Optional[str]:
+        """
+        Read the current branch from .git/HEAD without spawning git
+
+        Falls back to get_current_branch when HEAD can't be read directly
+        (e.g. .git is a file for worktrees and submodules).
+
+        Args:
+            target_path: Path to git repository
+
+        Returns:
+            Branch name, 'HEAD' if detached, or None if not in a git repo
+        """
+        try:
+            head = (Path(target_path) / '.git' / 'HEAD').read_text().strip()
+        except OSError:
+            return GitManager.get_current_branch(target_path)
+
+        if head.startswith(_HEAD_REF_PREFIX):
+            return head[_HEAD_REF_LEN:]
+        if head.startswith('ref: '):
+            return GitManager.get_current_branch(target_path)
+
+        # Detached HEAD holds a commit hash; match 'rev-parse --abbrev-ref'
+        return 'HEAD'
+
+    @classmethod
+    def get_repo_state(cls, target_path: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the current branch and remote origin URL in one call
+
+        Only the remote lookup spawns git; the branch is read from .git/HEAD,
+        so this costs one process instead of the two taken by calling
+        get_current_branch and get_current_remote separately. The result is
+        cached against the mtimes of .git/HEAD and .git/config, so asking
+        again while neither has changed costs two stat calls and no process.
+
+        Args:
+            target_path: Path to git repository
+
+        Returns:
+            Tuple of (branch_name, normalized_remote_url), None for unknown parts
+        """
+        git_dir = os.path.join(target_path, '.git')
+        try:
+            key = (
+                os.stat(os.path.join(git_dir, 'HEAD')).st_mtime_ns,
+                os.stat(os.path.join(git_dir, 'config')).st_mtime_ns
+            )
+        except OSError:
+            # Not a repository root (e.g. a subdirectory or worktree)
+            key = None
+
+        if key is not None:
+            cached = cls._status_cache.get(target_path)
+            if cached and cached[0] == key:
+                return cached[1]
+
+        state = (
+            cls._read_head_branch(target_path),
+            cls.get_current_remote(target_path)
+        )
+        # A None remote may be a timeout or git error; don't pin it in the
+        # cache, so the next call retries
+        if key is not None and state[1] is not None:
+            cls._status_cache[target_path] = (key, state)
+        return state
+
+    @staticmethod
+    def get_target_status(path: str) -> Tuple[DirectoryStatus, Optional[str], Optional[str]]:
+        """
+        Get directory status, remote origin URL and branch together
+
+        For the common case of a repository root this spawns a single git
+        process, where check_directory_status, get_current_remote and
+        get_current_branch take one each.
+
+        Args:
+            path: Path to check
+
+        Returns:
+            Tuple of (DirectoryStatus, normalized_remote_url, branch_name);
+            remote and branch are None unless the status is GIT_REPO
+        """
+        if not os.path.exists(path):
+            return DirectoryStatus.DOES_NOT_EXIST, None, None
+
+        # Not a repository root: ask git whether it is inside a work tree
+        if not os.path.isfile(os.path.join(path, '.git', 'HEAD')):
+            status = GitManager.check_directory_status(path)
+            if status != DirectoryStatus.GIT_REPO:
+                return status, None, None
+
+        branch, remote = GitManager.get_repo_state(path)
+        return DirectoryStatus.GIT_REPO, remote, branch
+
     @staticmethod
     def update_submodules(target_path: str) -> CommandResult:
         """
@@ -319,19 +553,19 @@ class GitManager:
         """
         try:
             print("\n=== Updating submodules ===")
-            result = subprocess.run(
+            returncode = run_command(
                 ['git', 'submodule', 'update', '--init', '--recursive'],
                 cwd=target_path,
                 timeout=300  # 5 minutes
             )
 
-            if result.returncode != 0:
-                raise GitError(f"Failed to update submodules (exit code: {result.returncode})")
+            if returncode != 0:
+                raise GitError(f"Failed to update submodules (exit code: {returncode})")
 
             print("=== Submodules updated successfully ===\n")
             return CommandResult(
                 success=True,
-                returncode=result.returncode
+                returncode=returncode
             )
 
         except subprocess.TimeoutExpired:
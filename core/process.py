@@ -0,0 +1,91 @@
+"""Subprocess helpers for sBitx Branch Manager"""
+
+import asyncio
+import subprocess
+from typing import Callable, List, Mapping, Optional, Sequence
+
+# Bytes requested per read when a command's output is piped. Reading in
+# large blocks rather than per line keeps syscall and callback counts low
+# for chatty commands such as compiler runs; see
+# https://docs.python.org/3/library/asyncio-stream.html#asyncio.StreamReader.read
+READ_CHUNK_SIZE = 65536
+
+
+async def _pump_output(
+    proc: asyncio.subprocess.Process,
+    on_output: Callable[[bytes], None]
+) -> int:
+    """Forward a process's piped output in chunks until it exits"""
+    while True:
+        chunk = await proc.stdout.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        on_output(chunk)
+    return await proc.wait()
+
+
+async def _run(
+    args: List[str],
+    cwd: Optional[str],
+    timeout: Optional[float],
+    on_output: Optional[Callable[[bytes], None]],
+    env: Optional[Mapping[str, str]]
+) -> int:
+    """Run a command on the current event loop and return its exit code"""
+    if on_output is None:
+        proc = await asyncio.create_subprocess_exec(*args, cwd=cwd, env=env)
+        done = proc.wait()
+    else:
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            limit=READ_CHUNK_SIZE
+        )
+        done = _pump_output(proc, on_output)
+
+    try:
+        return await asyncio.wait_for(done, timeout)
+    except BaseException as e:
+        # Covers timeouts and errors raised by on_output (e.g. a full disk
+        # while logging); never leave the child running behind the caller
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            raise subprocess.TimeoutExpired(args, timeout)
+        raise
+
+
+def run_command(
+    args: Sequence[str],
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = None,
+    on_output: Optional[Callable[[bytes], None]] = None,
+    env: Optional[Mapping[str, str]] = None
+) -> int:
+    """
+    Run a command and wait for it to exit
+
+    Unlike subprocess.run(timeout=...), which busy-polls the child while
+    waiting, the child is awaited on an asyncio event loop that is woken by
+    the kernel when it exits. Safe to call from worker threads.
+
+    Args:
+        args: Command and arguments
+        cwd: Working directory for the command
+        timeout: Seconds to wait before killing the command
+        on_output: Called with chunks of up to READ_CHUNK_SIZE bytes of the
+                   command's combined stdout/stderr. When None, the command
+                   inherits this process's stdout/stderr.
+        env: Environment for the command. Defaults to this process's.
+
+    Returns:
+        Exit code of the command
+
+    Raises:
+        subprocess.TimeoutExpired: If the command did not finish in time
+    """
+    return asyncio.run(_run(list(args), cwd, timeout, on_output, env))
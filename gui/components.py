@@ -1,39 +1,86 @@
 """Reusable GUI components for sBitx Branch Manager"""
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 from typing import Optional, Callable
 
 
+def _center_on_parent(window: tk.Toplevel, parent, width: int, height: int):
+    """
+    Size a window and center it on its parent in a single geometry call
+
+    The dialog's size is known up front, so there is no need to force a
+    Tk layout pass (update_idletasks) just to measure it.
+
+    Args:
+        window: Window to place
+        parent: Already laid-out parent window
+        width: Window width in pixels
+        height: Window height in pixels
+    """
+    x = parent.winfo_x() + (parent.winfo_width() - width) // 2
+    y = parent.winfo_y() + (parent.winfo_height() - height) // 2
+    window.geometry(f"{width}x{height}+{x}+{y}")
+
+
 class StatusBar(ttk.Frame):
     """Status bar widget showing current operation status"""
 
+    # Color coding based on status type
+    _COLORS = {
+        'info': '#17a2b8',
+        'success': '#28a745',
+        'error': '#dc3545',
+        'warning': '#ffc107',
+        'working': '#fd7e14'
+    }
+
+    # One ttk style per status type, e.g. 'Status.Error.TLabel'
+    _STYLES = {status_type: f'Status.{status_type.capitalize()}.TLabel' for status_type in _COLORS}
+    _DEFAULT_STYLE = 'Status.TLabel'
+
     def __init__(self, parent):
         super().__init__(parent)
+
+        # Bake the colors into named styles once so each update is a single
+        # configure call that only switches style
+        style = ttk.Style(self)
+        style.configure(self._DEFAULT_STYLE, foreground='#000000')
+        for status_type, color in self._COLORS.items():
+            style.configure(self._STYLES[status_type], foreground=color)
+
         self.label = ttk.Label(self, text="Ready", relief=tk.SUNKEN, anchor=tk.W)
         self.label.pack(fill=tk.X, expand=True, padx=2, pady=2)
 
+        # Shown only while background work is running
+        self.progress = ttk.Progressbar(self, mode='indeterminate', length=80)
+
     def set_status(self, message: str, status_type: str = "info"):
         """
         Set status message
 
         Args:
             message: Status message to display
-            status_type: Type of status (info, success, error, warning)
+            status_type: Type of status (info, success, error, warning, working)
         """
-        self.label.config(text=message)
+        self.label.configure(
+            text=message,
+            style=self._STYLES.get(status_type, self._DEFAULT_STYLE)
+        )
 
-        # Color coding based on status type
-        colors = {
-            'info': '#17a2b8',
-            'success': '#28a745',
-            'error': '#dc3545',
-            'warning': '#ffc107',
-            'working': '#fd7e14'
-        }
+    def set_busy(self, busy: bool):
+        """
+        Show or hide the activity indicator
 
-        fg_color = colors.get(status_type, '#000000')
-        self.label.config(foreground=fg_color)
+        Args:
+            busy: True while background work is running
+        """
+        if busy:
+            self.progress.pack(side=tk.RIGHT, before=self.label, padx=2, pady=2)
+            self.progress.start()
+        else:
+            self.progress.stop()
+            self.progress.pack_forget()
 
 
 class ProgressDialog(tk.Toplevel):
@@ -46,8 +93,7 @@ class ProgressDialog(tk.Toplevel):
         self.grab_set()
 
         # Center on parent - smaller size
-        self.geometry("350x120")
-        self._center_on_parent(parent)
+        _center_on_parent(self, parent, 350, 120)
 
         # Make it non-resizable
         self.resizable(False, False)
@@ -73,22 +119,6 @@ class ProgressDialog(tk.Toplevel):
         # Prevent closing
         self.protocol("WM_DELETE_WINDOW", lambda: None)
 
-    def _center_on_parent(self, parent):
-        """Center dialog on parent window"""
-        self.update_idletasks()
-        parent_x = parent.winfo_x()
-        parent_y = parent.winfo_y()
-        parent_width = parent.winfo_width()
-        parent_height = parent.winfo_height()
-
-        dialog_width = self.winfo_width()
-        dialog_height = self.winfo_height()
-
-        x = parent_x + (parent_width - dialog_width) // 2
-        y = parent_y + (parent_height - dialog_height) // 2
-
-        self.geometry(f"+{x}+{y}")
-
     def update_message(self, message: str):
         """Update the progress message"""
         self.message_label.config(text=message)
@@ -121,8 +151,7 @@ class ConfirmDialog(tk.Toplevel):
         self.on_cancel = on_cancel
 
         # Center on parent - smaller size
-        self.geometry("350x130")
-        self._center_on_parent(parent)
+        _center_on_parent(self, parent, 350, 130)
 
         # Make it non-resizable
         self.resizable(False, False)
@@ -167,22 +196,6 @@ class ConfirmDialog(tk.Toplevel):
         # Handle window close
         self.protocol("WM_DELETE_WINDOW", self._on_cancel)
 
-    def _center_on_parent(self, parent):
-        """Center dialog on parent window"""
-        self.update_idletasks()
-        parent_x = parent.winfo_x()
-        parent_y = parent.winfo_y()
-        parent_width = parent.winfo_width()
-        parent_height = parent.winfo_height()
-
-        dialog_width = self.winfo_width()
-        dialog_height = self.winfo_height()
-
-        x = parent_x + (parent_width - dialog_width) // 2
-        y = parent_y + (parent_height - dialog_height) // 2
-
-        self.geometry(f"+{x}+{y}")
-
     def _on_confirm(self):
         """Handle confirm button click"""
         self.result = True
@@ -209,7 +222,6 @@ def show_error(parent, title: str, message: str):
         title: Dialog title
         message: Error message
     """
-    from tkinter import messagebox
     messagebox.showerror(title, message, parent=parent)
 
 
@@ -222,7 +234,6 @@ def show_info(parent, title: str, message: str):
         title: Dialog title
         message: Info message
     """
-    from tkinter import messagebox
     messagebox.showinfo(title, message, parent=parent)
 
 
@@ -235,5 +246,4 @@ def show_warning(parent, title: str, message: str):
         title: Dialog title
         message: Warning message
     """
-    from tkinter import messagebox
     messagebox.showwarning(title, message, parent=parent)
@@ -4,9 +4,11 @@ import tkinter as tk
 from tkinter import ttk
 import threading
 import queue
-from typing import List, Optional
+import sys
+import time
+from typing import List, Optional, Set, Tuple
 
-from models.repository import Repository
+from models.repository import Repository, GITHUB_REPO_NAME_RE
 from core.config_manager import ConfigManager, ConfigError
 from core.git_manager import GitManager, GitError, DirectoryStatus
 from core.build_manager import BuildManager, BuildError
@@ -18,6 +20,12 @@ class MainWindow(tk.Tk):
 
     TARGET_PATH = "/home/pi/sbitx"
 
+    # Milliseconds a listbox selection must settle before branches are fetched
+    SELECT_DEBOUNCE_MS = 250
+
+    # Minimum seconds between target status refreshes triggered by errors
+    ERROR_REFRESH_INTERVAL = 2.0
+
     def __init__(self):
         super().__init__()
 
@@ -33,15 +41,41 @@ class MainWindow(tk.Tk):
         # Queue for thread communication
         self.task_queue = queue.Queue()
 
+        # Set once <<TaskReady>> has been fired and cleared when the drain
+        # starts, so a burst of messages wakes the UI once rather than per
+        # message. Each wake blocks the posting thread until Tk handles it.
+        self._wake_lock = threading.Lock()
+        self._wake_pending = False
+
+        # Workers fire <<TaskReady>> after queueing a message
+        self.bind('<<TaskReady>>', self._drain_queue)
+
         # Current state
         self.repositories: List[Repository] = []
+        # URLs in self.repositories, for membership tests
+        self._repo_urls: Set[str] = set()
         self.current_branches: List[str] = []
         self.selected_repo: Optional[Repository] = None
         self.selected_branch: Optional[str] = None
 
+        # (display_text, is_current) of each row currently in the listbox
+        self._rendered: List[Tuple[str, bool]] = []
+
+        # True while a background operation runs; user actions are ignored
+        self._busy = False
+
+        # Pending after() id for the debounced fetch on listbox selection
+        self._select_debounce_id: Optional[str] = None
+
         # Track current repo and branch in target directory
+        self.target_status: Optional[DirectoryStatus] = None
         self.current_repo_url: Optional[str] = None
         self.current_branch_name: Optional[str] = None
+        # owner/repo (or the raw URL) of current_repo_url for the status label
+        self.current_repo_name: Optional[str] = None
+
+        # time.monotonic() of the last error-triggered status refresh
+        self._last_status_refresh_ts = 0.0
 
         # Progress dialog
         self.progress_dialog: Optional[ProgressDialog] = None
@@ -52,15 +86,19 @@ class MainWindow(tk.Tk):
         # Load repositories
         self.load_repositories()
 
+        # Branch lists from the previous session
+        self.git_manager.restore_branch_cache(self.config_manager.load_branches_cache())
+
         # Update current status
         self.update_current_status()
 
         # Auto-fetch branches for selected repository
         if self.selected_repo:
-            self.on_fetch_branches()
+            self.show_cached_branches(self.selected_repo.url)
+            self.on_fetch_branches(refresh=False)
 
-        # Start queue polling
-        self.check_queue()
+        # Drain anything workers queued before the main loop started
+        self.after_idle(self._drain_queue)
 
         # Handle window close
         self.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -203,44 +241,86 @@ class MainWindow(tk.Tk):
 
             # Load repositories from config
             self.repositories = self.config_manager.load_repositories()
+            self._repo_urls = {repo.url for repo in self.repositories}
 
             # Auto-add current repository if not in list
-            if self.current_repo_url:
-                repo_urls = [repo.url for repo in self.repositories]
-                if self.current_repo_url not in repo_urls:
-                    # Create and add the current repository
-                    from models.repository import Repository
-                    current_repo = Repository.create_new(self.current_repo_url)
-                    if current_repo:
-                        self.config_manager.add_repository(current_repo)
-                        self.repositories.append(current_repo)
+            self.add_current_repository()
 
             self.update_repository_list()
         except ConfigError as e:
             show_error(self, "Configuration Error", str(e))
 
+    def add_current_repository(self):
+        """
+        Add the target directory's repository to the list if it is missing
+
+        Raises:
+            ConfigError: If the config cannot be saved
+        """
+        if self.current_repo_url and self.current_repo_url not in self._repo_urls:
+            # Create and add the current repository
+            current_repo = Repository.create_new(self.current_repo_url)
+            if current_repo:
+                self.config_manager.add_repository(current_repo)
+                self.repositories.append(current_repo)
+                self._repo_urls.add(current_repo.url)
+
+    def show_cached_branches(self, repo_url: str):
+        """
+        Show a repository's cached branch list, if any, regardless of age
+
+        Gives the branch dropdown content right away while a fetch that
+        follows brings it up to date.
+        """
+        cached = self.git_manager.get_cached_branches(repo_url)
+        if cached:
+            self.show_branches(cached)
+
     def detect_current_repo_branch(self):
         """Detect current repository and branch in target directory"""
         try:
-            status = self.git_manager.check_directory_status(self.TARGET_PATH)
-
-            if status == DirectoryStatus.GIT_REPO:
-                self.current_repo_url = self.git_manager.get_current_remote(self.TARGET_PATH)
-                self.current_branch_name = self.git_manager.get_current_branch(self.TARGET_PATH)
-            else:
-                self.current_repo_url = None
-                self.current_branch_name = None
+            result = self.git_manager.get_target_status(self.TARGET_PATH)
         except Exception:
+            result = None
+        self._set_target_status(result)
+
+    def _set_target_status(
+        self,
+        result: Optional[Tuple[DirectoryStatus, Optional[str], Optional[str]]]
+    ):
+        """Store a get_target_status() result, or None if detection failed"""
+        previous_remote = self.current_repo_url
+        if result is not None:
+            self.target_status, self.current_repo_url, self.current_branch_name = result
+        else:
+            self.target_status = None
             self.current_repo_url = None
             self.current_branch_name = None
 
-    def update_repository_list(self):
-        """Update the repository listbox with branch info and highlighting"""
-        self.repo_listbox.delete(0, tk.END)
+        # Extract the repo name here, once per change, rather than on every
+        # status redraw
+        remote = self.current_repo_url
+        if remote == previous_remote:
+            return
+        if remote:
+            match = GITHUB_REPO_NAME_RE.search(remote)
+            self.current_repo_name = match.group(1) if match else remote
+        else:
+            self.current_repo_name = None
 
+    def update_repository_list(self):
+        """
+        Update the repository listbox with branch info and highlighting
+
+        Only rows whose text or highlight changed since the last update are
+        re-inserted, so a refresh that changes nothing only reads the
+        current selection.
+        """
+        rows = []
+        current_index = None
         for i, repo in enumerate(self.repositories):
             # Check if this is the current repo
-            is_current = (self.current_repo_url and repo.url == self.current_repo_url)
+            is_current = bool(self.current_repo_url) and repo.url == self.current_repo_url
 
             # Format display text
             if is_current and self.current_branch_name:
@@ -248,19 +328,59 @@ class MainWindow(tk.Tk):
             else:
                 display_text = repo.display_name
 
-            self.repo_listbox.insert(tk.END, display_text)
-
-            # Highlight current repo with different background color
+            rows.append((display_text, is_current))
             if is_current:
-                self.repo_listbox.itemconfig(i, bg='#d4edda', fg='#155724')  # Light green background, dark green text
-                # Auto-select the current repo in the listbox
+                current_index = i
+
+        rendered = self._rendered
+        common = min(len(rows), len(rendered))
+        for i in range(common):
+            if rows[i] != rendered[i]:
+                self.repo_listbox.delete(i)
+                self._insert_repository_row(i, *rows[i])
+
+        if len(rendered) > len(rows):
+            self.repo_listbox.delete(len(rows), tk.END)
+        for i in range(common, len(rows)):
+            self._insert_repository_row(i, *rows[i])
+
+        self._rendered = rows
+
+        if current_index is not None:
+            # Auto-select the current repo in the listbox
+            if self.repo_listbox.curselection() != (current_index,):
                 self.repo_listbox.selection_clear(0, tk.END)
-                self.repo_listbox.selection_set(i)
-                self.repo_listbox.see(i)
-                self.selected_repo = repo
+                self.repo_listbox.selection_set(current_index)
+                self.repo_listbox.see(current_index)
+            self.selected_repo = self.repositories[current_index]
+        else:
+            # Re-inserted rows lose their selection; keep the selected repo's
+            # row selected even if removals above it shifted its index
+            self._reselect_selected_repo()
+
+    def _reselect_selected_repo(self):
+        """Make the listbox selection match selected_repo"""
+        if self.selected_repo is None:
+            return
+        for i, repo in enumerate(self.repositories):
+            if repo.url == self.selected_repo.url:
+                if self.repo_listbox.curselection() != (i,):
+                    self.repo_listbox.selection_clear(0, tk.END)
+                    self.repo_listbox.selection_set(i)
+                break
+
+    def _insert_repository_row(self, index: int, display_text: str, is_current: bool):
+        """Insert one listbox row, highlighting the target's current repo"""
+        self.repo_listbox.insert(index, display_text)
+        if is_current:
+            # Light green background, dark green text
+            self.repo_listbox.itemconfig(index, bg='#d4edda', fg='#155724')
 
     def on_add_repository(self):
         """Handle add repository button click"""
+        if self._busy:
+            return
+
         url = self.repo_entry.get().strip()
 
         if not url:
@@ -285,6 +405,7 @@ class MainWindow(tk.Tk):
         # Add to config
         if self.config_manager.add_repository(repo):
             self.repositories.append(repo)
+            self._repo_urls.add(repo.url)
             self.update_repository_list()
             # Select the newly added repository in the listbox
             new_index = len(self.repositories) - 1
@@ -299,6 +420,9 @@ class MainWindow(tk.Tk):
 
     def on_remove_repository(self):
         """Handle remove repository button click"""
+        if self._busy:
+            return
+
         selection = self.repo_listbox.curselection()
 
         if not selection:
@@ -319,6 +443,7 @@ class MainWindow(tk.Tk):
 
         if self.config_manager.remove_repository(repo.url):
             self.repositories.pop(index)
+            self._repo_urls.discard(repo.url)
             # Clear selection if we're removing the selected repo
             if self.selected_repo and self.selected_repo.url == repo.url:
                 self.selected_repo = None
@@ -329,6 +454,11 @@ class MainWindow(tk.Tk):
 
     def on_repo_listbox_select(self, event):
         """Handle repository selection from listbox"""
+        if self._busy:
+            # Undo the click; the running operation uses the selected repo
+            self._reselect_selected_repo()
+            return
+
         selection = self.repo_listbox.curselection()
         if selection:
             selected_index = selection[0]
@@ -339,36 +469,99 @@ class MainWindow(tk.Tk):
             self.selected_branch = None
             self.status_bar.set_status(f"Selected: {self.selected_repo.display_name}", "info")
 
-            # Automatically fetch branches
-            self.on_fetch_branches()
+            # Automatically fetch branches once the selection settles, so
+            # arrowing through the list doesn't start a fetch per row
+            if self._select_debounce_id:
+                self.after_cancel(self._select_debounce_id)
+            self._select_debounce_id = self.after(self.SELECT_DEBOUNCE_MS, self._do_select_fetch)
+
+    def _do_select_fetch(self):
+        """Fetch branches for the repository selected in the listbox"""
+        self._select_debounce_id = None
+        if self.selected_repo:
+            self.on_fetch_branches(refresh=False)
+
+    def on_fetch_branches(self, refresh: bool = True):
+        """
+        Handle fetch branches button click
+
+        Args:
+            refresh: Query the remote. When False, the target directory's
+                     local remote-tracking refs are used if it already
+                     tracks the selected repository, and otherwise a
+                     recently fetched list is reused.
+        """
+        if self._busy:
+            return
 
-    def on_fetch_branches(self):
-        """Handle fetch branches button click"""
         if not self.selected_repo:
             show_warning(self, "No Repository", "Please select a repository first")
             return
 
+        repo_url = self.selected_repo.url
+        use_local = not refresh and repo_url == self.current_repo_url
+        if not refresh and not use_local:
+            cached = self.git_manager.get_cached_branches(
+                repo_url, self.git_manager.BRANCH_CACHE_TTL
+            )
+            if cached is not None:
+                self.show_branches(cached)
+                return
+
         # Run in background thread
-        self.disable_controls()
+        self.set_busy(True)
         self.status_bar.set_status("Fetching branches...", "working")
 
         thread = threading.Thread(
             target=self._fetch_branches_thread,
-            args=(self.selected_repo.url,)
+            args=(self.selected_repo.url, refresh, use_local)
         )
         thread.daemon = True
         thread.start()
 
-    def _fetch_branches_thread(self, repo_url: str):
+    def _fetch_branches_thread(self, repo_url: str, refresh: bool, use_local: bool):
         """Background thread for fetching branches"""
         try:
-            branches = self.git_manager.fetch_branches(repo_url)
-            self.task_queue.put(('branches_fetched', branches))
+            branches = None
+            if use_local:
+                try:
+                    branches = self.git_manager.fetch_branches_local(self.TARGET_PATH)
+                except GitError:
+                    branches = None
+
+            if not branches:
+                if refresh:
+                    self.git_manager.invalidate_branch_cache(repo_url)
+                branches = self.git_manager.fetch_branches(repo_url)
+
+            self._post('branches_fetched', (repo_url, branches))
         except GitError as e:
-            self.task_queue.put(('error', str(e)))
+            self._post('error', str(e))
+
+    def show_branches(self, branches: List[str]):
+        """Populate the branch dropdown, preselecting the checked-out branch"""
+        self.current_branches = branches
+        self.branch_combo['values'] = branches
+
+        # Auto-select current branch if it exists in the list
+        if branches:
+            if self.current_branch_name and self.current_branch_name in branches:
+                # Select the current branch
+                index = branches.index(self.current_branch_name)
+                self.branch_combo.current(index)
+                self.selected_branch = self.current_branch_name
+            else:
+                # Default to first branch
+                self.branch_combo.current(0)
+                self.selected_branch = branches[0]
+
+        self.status_bar.set_status(f"Found {len(branches)} branches", "success")
 
     def on_checkout_and_build(self):
         """Handle checkout and build button click"""
+        if self._busy:
+            return
+
         if not self.selected_repo:
             show_warning(self, "No Repository", "Please select a repository")
             return
@@ -384,8 +577,8 @@ class MainWindow(tk.Tk):
             "Checking out repository and branch..."
         )
 
-        # Disable controls
-        self.disable_controls()
+        # Block other actions until done
+        self.set_busy(True)
 
         # Run in background thread
         thread = threading.Thread(
@@ -402,79 +595,98 @@ class MainWindow(tk.Tk):
             status = self.git_manager.check_directory_status(self.TARGET_PATH)
 
             if status == DirectoryStatus.NON_GIT:
-                self.task_queue.put((
+                self._post(
                     'error',
                     f"{self.TARGET_PATH} exists but is not a git repository.\n"
                     "Please backup and remove the directory first."
-                ))
+                )
                 return
 
             # Clone or change remote
             if status == DirectoryStatus.DOES_NOT_EXIST:
-                self.task_queue.put(('progress', 'Cloning repository...'))
+                self._post('progress', 'Cloning repository...')
                 self.git_manager.clone_repository(repo_url, self.TARGET_PATH)
             else:
-                self.task_queue.put(('progress', 'Changing remote and fetching...'))
+                self._post('progress', 'Changing remote and fetching...')
                 self.git_manager.change_remote(repo_url, self.TARGET_PATH)
 
             # Checkout branch
-            self.task_queue.put(('progress', f'Checking out branch {branch}...'))
+            self._post('progress', f'Checking out branch {branch}...')
             self.git_manager.checkout_branch(branch, self.TARGET_PATH)
 
             # Update submodules
-            self.task_queue.put(('progress', 'Updating submodules...'))
+            self._post('progress', 'Updating submodules...')
             self.git_manager.update_submodules(self.TARGET_PATH)
 
             # Build
-            self.task_queue.put(('progress', 'Building sBitx... (this may take several minutes)'))
-            build_result = self.build_manager.run_build(self.TARGET_PATH)
+            self._post('progress', 'Building sBitx... (this may take several minutes)')
+            build_log = self.config_manager.config_dir / 'build.log'
+            build_result = self.build_manager.run_build(
+                self.TARGET_PATH,
+                logfile=build_log,
+                on_line=self._on_build_line
+            )
 
             if build_result.success:
                 # Save last used
                 self.config_manager.set_last_used(repo_url, branch)
-                self.task_queue.put(('build_success', 'Build completed successfully!'))
+                self._post('build_success', 'Build completed successfully!')
             else:
-                self.task_queue.put((
+                self._post(
                     'build_error',
                     f"Build failed with exit code {build_result.returncode}.\n\n"
-                    "Check the terminal output for details."
-                ))
+                    f"Check the terminal output or {build_log} for details."
+                )
 
         except GitError as e:
-            self.task_queue.put(('error', f"Git error: {e}"))
+            self._post('error', f"Git error: {e}")
         except BuildError as e:
-            self.task_queue.put(('error', f"Build error: {e}"))
+            self._post('error', f"Build error: {e}")
         except Exception as e:
-            self.task_queue.put(('error', f"Unexpected error: {e}"))
-
-    def check_queue(self):
-        """Check task queue for messages from background threads"""
+            self._post('error', f"Unexpected error: {e}")
+
+    def _on_build_line(self, line: str):
+        """Stream a line of build output to the progress dialog"""
+        line = line.strip()
+        if line:
+            self._post('progress', line)
+
+    def _post(self, msg_type: str, msg_data):
+        """Queue a message from a background thread and wake the UI to handle it"""
+        with self._wake_lock:
+            self.task_queue.put((msg_type, msg_data))
+            wake = not self._wake_pending
+            self._wake_pending = True
+
+        # Fire outside the lock; the drain takes it on the main thread
+        if wake:
+            try:
+                self.event_generate('<<TaskReady>>', when='tail')
+            except (RuntimeError, tk.TclError):
+                # Main loop not running yet (drained on startup) or window closed
+                pass
+
+    def _drain_queue(self, event=None):
+        """Handle all queued messages from background threads"""
+        # Messages posted from here on need a new wake-up
+        with self._wake_lock:
+            self._wake_pending = False
+
+        progress = None
         try:
             while True:
                 msg_type, msg_data = self.task_queue.get_nowait()
 
                 if msg_type == 'branches_fetched':
-                    self.current_branches = msg_data
-                    self.branch_combo['values'] = msg_data
-
-                    # Auto-select current branch if it exists in the list
-                    if msg_data:
-                        if self.current_branch_name and self.current_branch_name in msg_data:
-                            # Select the current branch
-                            index = msg_data.index(self.current_branch_name)
-                            self.branch_combo.current(index)
-                            self.selected_branch = self.current_branch_name
-                        else:
-                            # Default to first branch
-                            self.branch_combo.current(0)
-                            self.selected_branch = msg_data[0]
-
-                    self.status_bar.set_status(f"Found {len(msg_data)} branches", "success")
-                    self.enable_controls()
+                    repo_url, branches = msg_data
+                    self.set_busy(False)
+                    # Drop results for a repository that is no longer selected
+                    if self.selected_repo and self.selected_repo.url == repo_url:
+                        self.show_branches(branches)
 
                 elif msg_type == 'progress':
-                    if self.progress_dialog:
-                        self.progress_dialog.update_message(msg_data)
+                    # Only the newest line is visible; show it once below
+                    progress = msg_data
 
                 elif msg_type == 'build_success':
                     if self.progress_dialog:
@@ -485,7 +697,7 @@ class MainWindow(tk.Tk):
                     self.detect_current_repo_branch()
                     self.update_repository_list()  # Refresh list with new highlighting
                     self.update_current_status()  # Update current repo/branch display
-                    self.enable_controls()
+                    self.set_busy(False)
                     show_info(self, "Success", msg_data)
 
                 elif msg_type == 'build_error':
@@ -498,7 +710,7 @@ class MainWindow(tk.Tk):
                     self.detect_current_repo_branch()
                     self.update_repository_list()
                     self.update_current_status()
-                    self.enable_controls()
+                    self.set_busy(False)
                     show_error(self, "Build Failed", msg_data)
 
                 elif msg_type == 'error':
@@ -507,66 +719,64 @@ class MainWindow(tk.Tk):
                         self.progress_dialog = None
                     self.status_bar.set_status("Operation failed", "error")
                     # Try to update current status in case branch was checked out
-                    # before the error occurred
-                    try:
-                        self.detect_current_repo_branch()
-                        self.update_repository_list()
-                        self.update_current_status()
-                    except:
-                        pass  # Ignore errors during status update
-                    self.enable_controls()
+                    # before the error occurred. Rate-limited so a burst of
+                    # errors doesn't re-run detection for each one.
+                    now = time.monotonic()
+                    if now - self._last_status_refresh_ts > self.ERROR_REFRESH_INTERVAL:
+                        self._last_status_refresh_ts = now
+                        try:
+                            self.detect_current_repo_branch()
+                            self.update_repository_list()
+                            self.update_current_status()
+                        except (GitError, OSError, tk.TclError) as e:
+                            print(f"Warning: failed to refresh status: {e}", file=sys.stderr)
+                    self.set_busy(False)
                     show_error(self, "Error", msg_data)
 
         except queue.Empty:
             pass
-        finally:
-            # Poll every 100ms
-            self.after(100, self.check_queue)
-
-    def disable_controls(self):
-        """Disable all interactive controls"""
-        self.add_repo_btn.config(state=tk.DISABLED)
-        self.remove_repo_btn.config(state=tk.DISABLED)
-        self.fetch_branches_btn.config(state=tk.DISABLED)
-        self.checkout_build_btn.config(state=tk.DISABLED)
-        self.repo_listbox.config(state=tk.DISABLED)
-        self.branch_combo.config(state=tk.DISABLED)
-
-    def enable_controls(self):
-        """Enable all interactive controls"""
-        self.add_repo_btn.config(state=tk.NORMAL)
-        self.remove_repo_btn.config(state=tk.NORMAL)
-        self.fetch_branches_btn.config(state=tk.NORMAL)
-        self.checkout_build_btn.config(state=tk.NORMAL)
-        self.repo_listbox.config(state=tk.NORMAL)
-        self.branch_combo.config(state='readonly')
+
+        if progress is not None and self.progress_dialog:
+            self.progress_dialog.update_message(progress)
+
+    def set_busy(self, busy: bool):
+        """
+        Mark a background operation as started or finished
+
+        Rather than disabling every control, handlers return early while
+        busy and the status bar shows an activity indicator.
+
+        Args:
+            busy: True when an operation starts, False when it ends
+        """
+        if busy != self._busy:
+            self._busy = busy
+            self.status_bar.set_busy(busy)
 
     def update_current_status(self):
         """Update display showing current repo and branch in target directory"""
         try:
-            # Check if directory exists and is a git repo
-            status = self.git_manager.check_directory_status(self.TARGET_PATH)
+            # Detection failed
+            if self.target_status is None:
+                self.current_status_label.config(
+                    text="Error reading status",
+                    foreground='#dc3545'  # Red color
+                )
+                return
 
-            if status != DirectoryStatus.GIT_REPO:
+            # Check if directory exists and is a git repo
+            if self.target_status != DirectoryStatus.GIT_REPO:
                 self.current_status_label.config(
                     text="No git repository at target path",
                     foreground='gray'
                 )
                 return
 
-            # Get current remote and branch
-            remote = self.git_manager.get_current_remote(self.TARGET_PATH)
-            branch = self.git_manager.get_current_branch(self.TARGET_PATH)
-
-            if remote and branch:
-                # Extract repo name from remote URL
-                import re
-                match = re.search(r'github\.com[/:]([\w-]+/[\w-]+)', remote)
-                if match:
-                    repo_name = match.group(1)
-                else:
-                    repo_name = remote
+            # Current branch and repo name, as last detected
+            branch = self.current_branch_name
+            repo_name = self.current_repo_name
 
+            if repo_name and branch:
                 self.current_status_label.config(
                     text=f"{repo_name} @ {branch}",
                     foreground='#28a745'  # Green color
@@ -585,10 +795,19 @@ class MainWindow(tk.Tk):
 
     def on_close(self):
         """Handle window close event"""
+        try:
+            self.config_manager.save_branches_cache(self.git_manager.branch_cache_snapshot())
+        except ConfigError as e:
+            print(f"Warning: {e}")
         self.destroy()
 
     def on_branch_combo_selected(self, event):
         """Handle branch selection from dropdown"""
+        if self._busy:
+            # Undo the change while branches are being fetched or built
+            self.branch_combo.set(self.selected_branch or '')
+            return
+
         selection = self.branch_combo.get()
         if selection:
             self.selected_branch = selection
@@ -1,10 +1,25 @@
 """Repository data model for sBitx Branch Manager"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 import re
 from typing import Optional
 
+# Already-normalized URL, as stored in the config and returned by git
+_CANONICAL_RE = re.compile(r'https://github\.com/[\w-]+/[\w-]+\.git')
+
+# Accepted input forms for validate_and_normalize_url
+_HTTPS_RE = re.compile(r'^https://github\.com/([\w-]+/[\w-]+)(\.git)?$')
+_SSH_RE = re.compile(r'^git@github\.com:([\w-]+/[\w-]+)(\.git)?$')
+_SHORT_RE = re.compile(r'^(github\.com/)?([\w-]+/[\w-]+)$')
+
+# owner/repo extraction for short_name
+_SHORT_HTTPS_RE = re.compile(r'github\.com/([^/]+/[^/]+?)(\.git)?$')
+_SHORT_SSH_RE = re.compile(r'github\.com:([^/]+/[^/]+?)(\.git)?$')
+
+# owner/repo from any GitHub URL, HTTPS or SSH
+GITHUB_REPO_NAME_RE = re.compile(r'github\.com[/:]([\w-]+/[\w-]+)')
+
 
 @dataclass
 class Repository:
@@ -12,26 +27,26 @@ class Repository:
     url: str
     display_name: str
     added_date: str
+    # owner/repo, derived from url once at construction
+    short_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Extract owner/repo from URL"""
+        # Extract from HTTPS URL: https://github.com/owner/repo.git
+        # or SSH URL: git@github.com:owner/repo.git
+        match = _SHORT_HTTPS_RE.search(self.url) or _SHORT_SSH_RE.search(self.url)
+
+        # Fallback to display_name
+        self.short_name = match.group(1) if match else self.display_name
 
     def get_short_name(self) -> str:
         """
-        Extract owner/repo from URL
+        Get owner/repo from URL
 
         Returns:
             Short name in format "owner/repo"
         """
-        # Extract from HTTPS URL: https://github.com/owner/repo.git
-        https_match = re.search(r'github\.com/([^/]+/[^/]+?)(\.git)?$', self.url)
-        if https_match:
-            return https_match.group(1)
-
-        # Extract from SSH URL: git@github.com:owner/repo.git
-        ssh_match = re.search(r'github\.com:([^/]+/[^/]+?)(\.git)?$', self.url)
-        if ssh_match:
-            return ssh_match.group(1)
-
-        # Fallback to display_name
-        return self.display_name
+        return self.short_name
 
     @staticmethod
     def validate_and_normalize_url(url: str) -> Optional[str]:
@@ -44,25 +59,26 @@ class Repository:
         Returns:
             Normalized URL with .git suffix, or None if invalid
         """
+        # Already normalized: skip stripping and the pattern cascade
+        if _CANONICAL_RE.fullmatch(url):
+            return url
+
         # Remove whitespace
         url = url.strip()
 
         # HTTPS pattern: https://github.com/user/repo or https://github.com/user/repo.git
-        https_pattern = r'^https://github\.com/([\w-]+/[\w-]+)(\.git)?$'
-        https_match = re.match(https_pattern, url)
+        https_match = _HTTPS_RE.match(url)
         if https_match:
             base = https_match.group(1)
             return f'https://github.com/{base}.git'
 
         # SSH pattern: git@github.com:user/repo or git@github.com:user/repo.git
-        ssh_pattern = r'^git@github\.com:([\w-]+/[\w-]+)(\.git)?$'
-        ssh_match = re.match(ssh_pattern, url)
+        ssh_match = _SSH_RE.match(url)
         if ssh_match:
             return url if url.endswith('.git') else url + '.git'
 
         # Short pattern: user/repo or github.com/user/repo
-        short_pattern = r'^(github\.com/)?([\w-]+/[\w-]+)$'
-        short_match = re.match(short_pattern, url)
+        short_match = _SHORT_RE.match(url)
         if short_match:
             user_repo = short_match.group(2)
             return f'https://github.com/{user_repo}.git'
@@ -102,15 +118,12 @@ class Repository:
         if not normalized_url:
             return None
 
-        # Extract display name from URL
-        display_name = re.search(r'github\.com[/:]([\w-]+/[\w-]+)', normalized_url)
-        if display_name:
-            display_name = display_name.group(1)
-        else:
-            display_name = normalized_url
-
-        return Repository(
+        repo = Repository(
             url=normalized_url,
-            display_name=display_name,
+            display_name=normalized_url,
             added_date=datetime.now().isoformat()
         )
+
+        # Display name is the owner/repo part of the URL, falling back to the URL
+        repo.display_name = repo.short_name
+        return repo